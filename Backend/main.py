@@ -3,13 +3,14 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.auth import auth_bp
 from src.routes.opportunity import opportunity_bp
 from src.routes.ai_recommendations import ai_bp
+from src.static_assets import StaticManifest
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'afaq_platform_secret_key_2024'
@@ -34,21 +35,17 @@ from src.models.opportunity import Opportunity, Vote, Comment, NDAAcceptance
 with app.app_context():
     db.create_all()
 
+# Load the built frontend into memory once so static requests never touch the disk.
+# This is a snapshot taken at startup: restart the server after rebuilding the frontend.
+static_manifest = StaticManifest(app.static_folder).build()
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    response = static_manifest.serve(path)
+    if response is None:
+        return "index.html not found", 404
+    return response
 
 
 if __name__ == '__main__':
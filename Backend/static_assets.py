@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response, request, send_file
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, pre-built .br files are still served
+    brotli = None
+
+# Uncompressed bytes of files bigger than this stay on disk and are streamed by send_file
+MAX_CACHED_SIZE = 2 * 1024 * 1024
+# Compressing tiny files is not worth the extra headers
+MIN_COMPRESS_SIZE = 512
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'application/manifest+json',
+    'image/svg+xml',
+)
+
+PRECOMPRESSED_SUFFIXES = {'.br': 'br', '.gz': 'gzip'}
+# Preferred order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+# Content hash right before the extension: Vite's 8 char base64url after a dash
+# ("index-B-x3_aQ1.js", skipping plain lowercase words like "team-portrait.jpg")
+# or webpack/CRA hex after a dot ("main.8e1d2f0a.css", "787.abc12345.chunk.js")
+FINGERPRINT_RE = re.compile(
+    r'(?:-(?![a-z-]{8}\.)[A-Za-z0-9_-]{8}|\.[0-9a-f]{8,20}(?:\.chunk)?)\.[A-Za-z0-9]+$'
+)
+# Only bundler output directories hold hashed files, so hand-named assets elsewhere stay revalidatable
+FINGERPRINT_DIRS = ('assets/', 'static/js/', 'static/css/', 'static/media/')
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+DEFAULT_CACHE = 'public, max-age=3600'
+
+
+def is_fingerprinted(path):
+    """Check whether a file is bundler output carrying a content hash"""
+    if not path.startswith(FINGERPRINT_DIRS):
+        return False
+    return FINGERPRINT_RE.search(os.path.basename(path)) is not None
+
+
+def is_compressible(mimetype):
+    """Check whether a mimetype benefits from gzip/brotli"""
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+class StaticAsset:
+    """A single file of the static folder with its encoded variants"""
+
+    def __init__(self, rel_path, full_path, mimetype, etag, cache_control, size):
+        self.rel_path = rel_path
+        self.full_path = full_path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        self.size = size
+        # encoding -> bytes, 'identity' is only present for files up to MAX_CACHED_SIZE
+        self.variants = {}
+
+
+class StaticManifest:
+    """In-memory index of the static folder built once at startup"""
+
+    def __init__(self, static_folder, index_file='index.html'):
+        self.static_folder = static_folder
+        self.index_file = index_file
+        self.assets = {}
+
+    def build(self):
+        """Scan the static folder and load every asset into memory"""
+        assets = {}
+        if self.static_folder and os.path.isdir(self.static_folder):
+            for root, _dirs, files in os.walk(self.static_folder):
+                names = set(files)
+                for name in files:
+                    base, ext = os.path.splitext(name)
+                    # Pre-built variants are attached to their source file
+                    if ext in PRECOMPRESSED_SUFFIXES and base in names:
+                        continue
+                    full_path = os.path.join(root, name)
+                    rel_path = os.path.relpath(full_path, self.static_folder).replace(os.sep, '/')
+                    assets[rel_path] = self._load_asset(rel_path, full_path)
+        self.assets = assets
+        return self
+
+    def _load_asset(self, rel_path, full_path):
+        """Read a file and prepare its compressed variants"""
+        mimetype, file_encoding = mimetypes.guess_type(rel_path)
+        if file_encoding is not None:
+            # A compressed file without its source is served as the archive itself
+            mimetype = 'application/gzip' if file_encoding == 'gzip' else 'application/octet-stream'
+        mimetype = mimetype or 'application/octet-stream'
+        size = os.path.getsize(full_path)
+
+        if rel_path == self.index_file:
+            cache_control = REVALIDATE_CACHE
+        elif is_fingerprinted(rel_path):
+            cache_control = IMMUTABLE_CACHE
+        else:
+            cache_control = DEFAULT_CACHE
+
+        compressible = is_compressible(mimetype) and size >= MIN_COMPRESS_SIZE
+
+        data = None
+        if size <= MAX_CACHED_SIZE or compressible:
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            etag = hashlib.sha256(data).hexdigest()[:32]
+        else:
+            # Large media is never read at startup
+            etag = '%x-%x' % (int(os.path.getmtime(full_path)), size)
+
+        asset = StaticAsset(rel_path, full_path, mimetype, etag, cache_control, size)
+        if size <= MAX_CACHED_SIZE:
+            asset.variants['identity'] = data
+
+        for suffix, encoding in PRECOMPRESSED_SUFFIXES.items():
+            if os.path.isfile(full_path + suffix):
+                with open(full_path + suffix, 'rb') as f:
+                    asset.variants[encoding] = f.read()
+
+        if compressible:
+            if 'gzip' not in asset.variants:
+                asset.variants['gzip'] = gzip.compress(data, compresslevel=9, mtime=0)
+            if 'br' not in asset.variants and brotli is not None:
+                asset.variants['br'] = brotli.compress(data)
+
+        # Drop variants that did not actually save any bytes
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in asset.variants and len(asset.variants[encoding]) >= size:
+                del asset.variants[encoding]
+        return asset
+
+    def lookup(self, path):
+        """Return the asset for a request path, falling back to index.html"""
+        if path:
+            asset = self.assets.get(path)
+            if asset is not None:
+                return asset
+        return self.assets.get(self.index_file)
+
+    def serve(self, path):
+        """Build the response for a static path"""
+        asset = self.lookup(path)
+        if asset is None:
+            return None
+
+        encoding = choose_encoding(asset)
+
+        if encoding == 'identity' and 'identity' not in asset.variants:
+            response = send_file(asset.full_path, mimetype=asset.mimetype,
+                                 conditional=True, etag=asset.etag)
+        else:
+            etag = asset.etag if encoding == 'identity' else '%s-%s' % (asset.etag, encoding)
+            response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+            response.set_etag(etag)
+            # Handles If-None-Match (weak comparison, 304) and byte ranges of the raw file
+            response.make_conditional(request, accept_ranges=encoding == 'identity',
+                                      complete_length=len(asset.variants[encoding]))
+
+        response.headers['Cache-Control'] = asset.cache_control
+        if any(encoding in asset.variants for encoding in ENCODING_PREFERENCE):
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+def choose_encoding(asset):
+    """Pick the best available encoding for the current request"""
+    offered = [encoding for encoding in ENCODING_PREFERENCE if encoding in asset.variants]
+    if not offered:
+        return 'identity'
+    best = request.accept_encodings.best_match(offered)
+    return best or 'identity'
@@ -0,0 +1,168 @@
+import gzip
+import os
+
+import pytest
+from flask import Flask
+
+from src.static_assets import (
+    DEFAULT_CACHE,
+    IMMUTABLE_CACHE,
+    MAX_CACHED_SIZE,
+    REVALIDATE_CACHE,
+    StaticManifest,
+    is_fingerprinted,
+)
+
+INDEX_HTML = b'<!doctype html><html><body><div id="root"></div></body></html>'
+APP_JS = b'console.log("afaq");\n' * 200
+
+
+def write(root, rel_path, data):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    root = str(tmp_path)
+    write(root, 'index.html', INDEX_HTML)
+    write(root, 'assets/index-B-x3_aQ1.js', APP_JS)
+    write(root, 'assets/index-B-x3_aQ1.js.br', b'prebuilt-brotli')
+    write(root, 'favicon.ico', b'\x00' * 64)
+    write(root, 'video.mp4', bytes(range(256)) * 4)
+    write(root, 'downloads/data.js.gz', gzip.compress(b'var data = 1;'))
+    return root
+
+
+@pytest.fixture
+def client(static_dir):
+    app = Flask(__name__)
+    manifest = StaticManifest(static_dir).build()
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        response = manifest.serve(path)
+        if response is None:
+            return "index.html not found", 404
+        return response
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('path', [
+    'assets/index-DiwrgTda.js',
+    'assets/index-B-x3_aQ1.js',
+    'assets/index-BRk0Q_-3.css',
+    'assets/vendor-Ab_cd-Ef.js',
+    'static/js/main.8e1d2f0a.js',
+    'static/js/787.abc12345.chunk.js',
+    'static/css/main.8e1d2f0a.css',
+])
+def test_fingerprinted_names(path):
+    assert is_fingerprinted(path)
+
+
+@pytest.mark.parametrize('path', [
+    'index.html',
+    'team-member-01.jpg',
+    'hero-image-v2.png',
+    'Screenshot-2024-01-01.png',
+    'apple-touch-icon-180x180.png',
+    'android-chrome-192x192.png',
+    'assets/team-portrait.jpg',
+    'assets/team-member-01.jpg',
+    'assets/apple-touch-icon-180x180.png',
+    'index-DiwrgTda.js',
+])
+def test_plain_names_are_not_fingerprinted(path):
+    assert not is_fingerprinted(path)
+
+
+def test_brotli_preferred_over_gzip(client):
+    response = client.get('/assets/index-B-x3_aQ1.js', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data == b'prebuilt-brotli'
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_gzip_when_brotli_not_accepted(client):
+    response = client.get('/assets/index-B-x3_aQ1.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == APP_JS
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_identity_without_accept_encoding(client):
+    response = client.get('/assets/index-B-x3_aQ1.js')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == APP_JS
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_not_modified_on_matching_etag(client):
+    first = client.get('/assets/index-B-x3_aQ1.js', headers={'Accept-Encoding': 'gzip'})
+    etag = first.headers['ETag']
+    response = client.get('/assets/index-B-x3_aQ1.js', headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': 'W/' + etag,
+    })
+    assert response.status_code == 304
+    assert response.data == b''
+    assert 'Content-Type' not in response.headers
+    assert response.headers['ETag'] == etag
+
+
+def test_spa_routes_fall_back_to_index(client):
+    response = client.get('/opportunities/42')
+    assert response.status_code == 200
+    assert response.data == INDEX_HTML
+    assert response.headers['Cache-Control'] == REVALIDATE_CACHE
+    assert 'ETag' in response.headers
+
+
+def test_missing_index_returns_none(tmp_path):
+    app = Flask(__name__)
+    with app.test_request_context('/'):
+        assert StaticManifest(str(tmp_path)).build().serve('') is None
+        assert StaticManifest(None).build().serve('anything') is None
+
+
+def test_byte_range_on_identity(client):
+    response = client.get('/video.mp4', headers={'Range': 'bytes=0-99'})
+    assert response.status_code == 206
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['Content-Range'] == 'bytes 0-99/1024'
+    assert response.data == (bytes(range(256)) * 4)[:100]
+
+
+def test_orphan_gzip_served_as_archive(client):
+    response = client.get('/downloads/data.js.gz', headers={'Accept-Encoding': 'gzip'})
+    assert response.mimetype == 'application/gzip'
+    assert 'Content-Encoding' not in response.headers
+    assert gzip.decompress(response.data) == b'var data = 1;'
+    assert response.headers['Cache-Control'] == DEFAULT_CACHE
+
+
+def test_large_file_still_compressed(static_dir):
+    big = b'export const vendor = 1;\n' * (MAX_CACHED_SIZE // 20)
+    write(static_dir, 'assets/vendor-Ab_cd-Ef.js', big)
+    app = Flask(__name__)
+    manifest = StaticManifest(static_dir).build()
+    asset = manifest.assets['assets/vendor-Ab_cd-Ef.js']
+    assert 'identity' not in asset.variants
+
+    with app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+        response = manifest.serve('assets/vendor-Ab_cd-Ef.js')
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == big
+
+    with app.test_request_context('/'):
+        response = manifest.serve('assets/vendor-Ab_cd-Ef.js')
+        response.direct_passthrough = False
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_data() == big
+        assert response.headers['ETag'] == '"%s"' % asset.etag